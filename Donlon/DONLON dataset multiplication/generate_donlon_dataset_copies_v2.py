@@ -49,6 +49,8 @@ Run with no command-line arguments to be prompted for each input on its own line
 (an empty answer or a single hyphen '-' leaves an optional field unset):
   python generate_donlon_dataset_copies_v2.py
 
+Requires lxml and NumPy (pip install lxml numpy).
+
 Usage example:
 python generate_donlon_dataset_copies_v2.py
 Use hyphen '-' to leave an optional input empty.
@@ -79,12 +81,15 @@ Input parameters:
 import argparse
 import copy
 import math
+import multiprocessing
 import os
 import re
 import sys
 import uuid
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import numpy as np
 from lxml import etree
 
 # Counter for xlink references intentionally not carried over to clones
@@ -172,6 +177,7 @@ ALL_FEATURES_ORDER = [
 ]
 
 NAVAID_EQUIPMENT_TYPES = ['VOR', 'DME', 'NDB', 'TACAN', 'Localizer', 'Glidepath', 'MarkerBeacon']
+NAVAID_AND_EQUIPMENT_TYPES = {'Navaid', *NAVAID_EQUIPMENT_TYPES}
 
 VS_PROPERTIES_TO_REMOVE = [
     'hostedPassengerService',
@@ -182,6 +188,14 @@ VS_PROPERTIES_TO_REMOVE = [
     'supportedService',
 ]
 
+# Compiled queries on a VerticalStructureTimeSlice: the designator of every
+# VerticalStructurePart that is not xsi:nil, and the properties to remove.
+_VS_PART_DESIGNATORS = etree.XPath(
+    './/aixm:VerticalStructurePart/aixm:designator[1]'
+    '[not(@xsi:nil) or @xsi:nil = ""]', namespaces=NSMAP)
+_VS_REMOVED_PROPERTIES = etree.XPath(
+    ' | '.join(f'aixm:{name}' for name in VS_PROPERTIES_TO_REMOVE), namespaces=NSMAP)
+
 # AirportHeliport designator prefixes by name substring (case-insensitive).
 AIRPORT_DESIGNATOR_PREFIX = [
     ('DONLON/DOWNTOWN HELIPORT', 'EAH'),
@@ -222,6 +236,13 @@ def generate_new_uuid():
     return str(uuid.uuid4())
 
 
+def generate_new_uuids(count):
+    """count random (version 4) UUIDs drawn from a single os.urandom call."""
+    data = os.urandom(16 * count)
+    return [str(uuid.UUID(bytes=data[i:i + 16], version=4))
+            for i in range(0, len(data), 16)]
+
+
 def haversine_distance_nm(lat1, lon1, lat2, lon2):
     """Great-circle distance in nautical miles between two points (degrees)."""
     R_nm = 3440.065
@@ -394,6 +415,15 @@ POSITION_OVERRIDES = {
 GML_IDENTIFIER = '{http://www.opengis.net/gml/3.2}identifier'
 AIXM_NAME = '{http://www.aixm.aero/schema/5.1.1}name'
 AIXM_NS = '{http://www.aixm.aero/schema/5.1.1}'
+# Clark-notation tags for the element lookups on the hot paths: find() with a
+# plain tag skips the prefix resolution of find('aixm:...', NSMAP).
+AIXM_TIMESLICE = AIXM_NS + 'timeSlice'
+AIXM_DESIGNATOR = AIXM_NS + 'designator'
+AIXM_DESIGNATOR_ICAO = AIXM_NS + 'designatorICAO'
+AIXM_LOCATION_INDICATOR_ICAO = AIXM_NS + 'locationIndicatorICAO'
+AIXM_TYPE = AIXM_NS + 'type'
+AIXM_SEQUENCE_NUMBER = AIXM_NS + 'sequenceNumber'
+AIXM_CORRECTION_NUMBER = AIXM_NS + 'correctionNumber'
 
 # Temporality use-case templates.  The whole folder is replicated into every
 # Donlon_Copy_NN/ as Temporality_cases_NN/, each file with the referenced
@@ -479,8 +509,8 @@ def apply_position_overrides(root):
 def find_airspace_polygon_by_uuid(root, feature_uuid):
     """Return the exterior polygon (list of (lat, lon)) of the Airspace whose
     gml:identifier equals feature_uuid, or None."""
-    for member in root.findall('message:hasMember', NSMAP):
-        airspace = member.find('aixm:Airspace', NSMAP)
+    for member in root.findall(MSG_NS + 'hasMember'):
+        airspace = member.find(AIXM_NS + 'Airspace')
         if airspace is None or get_feature_uuid(airspace) != feature_uuid:
             continue
         for pos_list in airspace.iter(GML_POSLIST):
@@ -591,101 +621,167 @@ def build_fir_grid(polygon, rows, cols, num_copies, margin_frac=0.10):
     return cells
 
 
+def grid_transforms(cells, anchor_lat):
+    """Per-cell scene transform for moving the anchor onto each grid cell (see
+    transform_all_coordinates), computed for the whole grid at once.
+
+    Returns (lat_offsets, lon_scales), lists in the order of cells:
+    lat_offset = cell_lat - anchor_lat and lon_scale = cos(anchor_lat) /
+    cos(cell_lat), or 1.0 where the cell's cosine vanishes."""
+    lats = np.array([cell['lat'] for cell in cells], dtype=np.float64)
+    cos_target = np.cos(np.radians(lats))
+    safe = np.abs(cos_target) > 1e-6
+    lon_scales = np.ones_like(lats)
+    lon_scales[safe] = math.cos(math.radians(anchor_lat)) / cos_target[safe]
+    return (lats - anchor_lat).tolist(), lon_scales.tolist()
+
+
 # ---------------------------------------------------------------------------
 # Feature extraction
 # ---------------------------------------------------------------------------
 
 
 def get_feature_uuid(feature_elem):
-    ident = feature_elem.find('gml:identifier', NSMAP)
+    ident = feature_elem.find(GML_IDENTIFIER)
     return ident.text.strip() if ident is not None and ident.text else None
 
 
-def get_ref_uuid(feature_elem, ref_element_name):
-    """UUID referenced by aixm:<ref_element_name> inside the feature's
-    TimeSlice, or None."""
-    for child in feature_elem.iter():
-        tag = child.tag
-        if isinstance(tag, str) and 'TimeSlice' in tag and child is not feature_elem:
-            ref = child.find(f'aixm:{ref_element_name}', NSMAP)
-            if ref is not None:
-                href = ref.get(XLINK_HREF)
-                if href and href.startswith('urn:uuid:'):
-                    return href.replace('urn:uuid:', '')
-            break
+def get_first_timeslice(feature_elem):
+    """The feature's first <Type>TimeSlice: the schema places it directly under
+    feature/aixm:timeSlice, so it is reached without walking the subtree."""
+    wrapper = feature_elem.find(AIXM_TIMESLICE)
+    if wrapper is None:
+        return None
+    for ts in wrapper:
+        if isinstance(ts.tag, str):
+            return ts
     return None
 
 
+def get_timeslice_refs(feature_elem):
+    """{ property_name: referenced_uuid } for the properties carried directly by
+    the feature's first TimeSlice.  Only the first occurrence of each property is
+    recorded; its value is None when it carries no urn:uuid: reference."""
+    refs = {}
+    ts = get_first_timeslice(feature_elem)
+    if ts is None:
+        return refs
+    for prop in ts:
+        if not (isinstance(prop.tag, str) and prop.tag.startswith(AIXM_NS)):
+            continue
+        name = prop.tag[len(AIXM_NS):]
+        if name in refs:
+            continue
+        href = prop.get(XLINK_HREF)
+        if href and href.startswith('urn:uuid:'):
+            refs[name] = sys.intern(href.replace('urn:uuid:', ''))
+        else:
+            refs[name] = None
+    return refs
+
+
+def build_reference_index(features_by_type):
+    """{ uuid: { property_name: referenced_uuid } } for every extracted feature,
+    built in a single pass so the collection step only does dict lookups instead
+    of re-walking each feature once per property it follows."""
+    return {fuuid: get_timeslice_refs(felem)
+            for by_uuid in features_by_type.values()
+            for fuuid, felem in by_uuid.items()}
+
+
 def get_feature_designator(feature_elem):
-    for child in feature_elem.iter():
-        tag = child.tag
-        if isinstance(tag, str) and 'TimeSlice' in tag and child is not feature_elem:
-            d = child.find('aixm:designator', NSMAP)
-            if d is not None and d.text:
-                return d.text.strip()
-            break
+    ts = get_first_timeslice(feature_elem)
+    if ts is not None:
+        d = ts.find(AIXM_DESIGNATOR)
+        if d is not None and d.text:
+            return d.text.strip()
     return None
 
 
 def get_airport_name(feature_elem):
-    for child in feature_elem.iter():
-        tag = child.tag
-        if isinstance(tag, str) and 'AirportHeliportTimeSlice' in tag:
-            n = child.find('aixm:name', NSMAP)
-            if n is not None and n.text:
-                return n.text
-            break
+    ts = get_first_timeslice(feature_elem)
+    if ts is not None and 'AirportHeliportTimeSlice' in ts.tag:
+        n = ts.find(AIXM_NAME)
+        if n is not None and n.text:
+            return n.text
     return None
 
 
 def get_feature_name(feature_elem):
     """Return the aixm:name text from the feature's first TimeSlice, or None.
     Returns the raw text (not stripped) since names can contain spaces."""
-    for child in feature_elem.iter():
-        tag = child.tag
-        if isinstance(tag, str) and 'TimeSlice' in tag and child is not feature_elem:
-            n = child.find('aixm:name', NSMAP)
-            if n is not None and n.text:
-                return n.text
-            return None
+    ts = get_first_timeslice(feature_elem)
+    if ts is not None:
+        n = ts.find(AIXM_NAME)
+        if n is not None and n.text:
+            return n.text
     return None
 
 
 def get_feature_begin_positions(feature_elem):
     """Return (validTime_begin, featureLifetime_begin) text from the feature's
     first TimeSlice; each element is None if absent."""
-    for child in feature_elem.iter():
-        tag = child.tag
-        if isinstance(tag, str) and 'TimeSlice' in tag and child is not feature_elem:
-            vt = child.find('gml:validTime/gml:TimePeriod/gml:beginPosition', NSMAP)
-            fl = child.find('aixm:featureLifetime/gml:TimePeriod/gml:beginPosition', NSMAP)
-            return (vt.text if vt is not None else None,
-                    fl.text if fl is not None else None)
-    return None, None
+    ts = get_first_timeslice(feature_elem)
+    if ts is None:
+        return None, None
+    vt = ts.find('gml:validTime/gml:TimePeriod/gml:beginPosition', NSMAP)
+    fl = ts.find('aixm:featureLifetime/gml:TimePeriod/gml:beginPosition', NSMAP)
+    return (vt.text if vt is not None else None,
+            fl.text if fl is not None else None)
 
 
 def get_airspace_type(feature_elem):
-    for child in feature_elem.iter():
-        tag = child.tag
-        if isinstance(tag, str) and 'AirspaceTimeSlice' in tag:
-            t = child.find('aixm:type', NSMAP)
-            if t is not None and t.text:
-                return t.text.strip()
-            break
+    ts = get_first_timeslice(feature_elem)
+    if ts is not None and 'AirspaceTimeSlice' in ts.tag:
+        t = ts.find(AIXM_TYPE)
+        if t is not None and t.text:
+            return t.text.strip()
     return None
 
 
+# Source feature types kept in memory besides FEATURE_TYPES: the shared
+# Donlon_OrganisationAuthority.xml is written from these.
+SOURCE_EXTRA_TYPES = ['OrganisationAuthority']
+
+
+def parse_source(path, keep_types):
+    """Stream-parse the input AIXM message and return its root element, holding
+    only the message:hasMember entries whose feature type is in keep_types.
+
+    Every other member is cleared as soon as its end tag is read (its content is
+    freed immediately) and the empty shells are dropped once parsing completes,
+    so peak memory follows the retained features instead of the whole baseline
+    DOM.  Retained members keep their exact source text, tails and namespace
+    context, as with a plain etree.parse."""
+    keep_types = set(keep_types)
+    context = etree.iterparse(path, events=('end',), tag=MSG_NS + 'hasMember')
+    discarded = []
+    for _event, member in context:
+        feat = _find_member_feature(member)
+        if feat is not None and feat.tag[len(AIXM_NS):] in keep_types:
+            continue
+        member.clear(keep_tail=True)
+        discarded.append(member)
+    root = context.root
+    for member in discarded:
+        root.remove(member)
+    return root
+
+
 def extract_features_by_type(root):
-    """{ type_name: { uuid: element } }."""
+    """{ type_name: { uuid: element } }.  The UUIDs are interned: they are the
+    keys of every later lookup, and the references resolved against them are
+    interned too (get_timeslice_refs)."""
     result = {ft: {} for ft in FEATURE_TYPES}
-    for member in root.findall('message:hasMember', NSMAP):
-        for ft in FEATURE_TYPES:
-            elem = member.find(f'aixm:{ft}', NSMAP)
-            if elem is not None:
-                feat_uuid = get_feature_uuid(elem)
-                if feat_uuid:
-                    result[ft][feat_uuid] = elem
-                break
+    tag_to_type = {AIXM_NS + ft: ft for ft in FEATURE_TYPES}
+    for member in root.findall(MSG_NS + 'hasMember'):
+        elem = _find_member_feature(member)
+        ft = tag_to_type.get(elem.tag) if elem is not None else None
+        if ft is None:
+            continue
+        feat_uuid = get_feature_uuid(elem)
+        if feat_uuid:
+            result[ft][sys.intern(feat_uuid)] = elem
     return result
 
 
@@ -701,6 +797,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
     """
     collected = {}
     airport_membership = {}
+    refs = build_reference_index(features_by_type)
 
     for fuuid, felem in features_by_type['AirportHeliport'].items():
         collected[fuuid] = ('AirportHeliport', felem)
@@ -709,7 +806,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
     runway_to_airport = {}
     for fuuid, felem in features_by_type['Runway'].items():
         collected[fuuid] = ('Runway', felem)
-        ahp_uuid = get_ref_uuid(felem, 'associatedAirportHeliport')
+        ahp_uuid = refs[fuuid].get('associatedAirportHeliport')
         if ahp_uuid:
             runway_to_airport[fuuid] = ahp_uuid
             airport_membership[fuuid] = ahp_uuid
@@ -717,7 +814,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
     rwydir_to_runway = {}
     for fuuid, felem in features_by_type['RunwayDirection'].items():
         collected[fuuid] = ('RunwayDirection', felem)
-        rwy_uuid = get_ref_uuid(felem, 'usedRunway')
+        rwy_uuid = refs[fuuid].get('usedRunway')
         if rwy_uuid:
             rwydir_to_runway[fuuid] = rwy_uuid
             ahp_uuid = runway_to_airport.get(rwy_uuid)
@@ -726,7 +823,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
 
     for fuuid, felem in features_by_type['RunwayElement'].items():
         collected[fuuid] = ('RunwayElement', felem)
-        rwy_uuid = get_ref_uuid(felem, 'associatedRunway')
+        rwy_uuid = refs[fuuid].get('associatedRunway')
         if rwy_uuid:
             ahp_uuid = runway_to_airport.get(rwy_uuid)
             if ahp_uuid:
@@ -734,7 +831,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
 
     for fuuid, felem in features_by_type['RunwayCentrelinePoint'].items():
         collected[fuuid] = ('RunwayCentrelinePoint', felem)
-        rwydir_uuid = get_ref_uuid(felem, 'onRunway')
+        rwydir_uuid = refs[fuuid].get('onRunway')
         if rwydir_uuid:
             rwy_uuid = rwydir_to_runway.get(rwydir_uuid)
             if rwy_uuid:
@@ -745,7 +842,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
     tdlof_to_airport = {}
     for fuuid, felem in features_by_type['TouchDownLiftOff'].items():
         collected[fuuid] = ('TouchDownLiftOff', felem)
-        ahp_uuid = get_ref_uuid(felem, 'associatedAirportHeliport')
+        ahp_uuid = refs[fuuid].get('associatedAirportHeliport')
         if ahp_uuid:
             tdlof_to_airport[fuuid] = ahp_uuid
             airport_membership[fuuid] = ahp_uuid
@@ -753,14 +850,14 @@ def collect_features(features_by_type, ase_types_exclude=None):
     taxiway_to_airport = {}
     for fuuid, felem in features_by_type['Taxiway'].items():
         collected[fuuid] = ('Taxiway', felem)
-        ahp_uuid = get_ref_uuid(felem, 'associatedAirportHeliport')
+        ahp_uuid = refs[fuuid].get('associatedAirportHeliport')
         if ahp_uuid:
             taxiway_to_airport[fuuid] = ahp_uuid
             airport_membership[fuuid] = ahp_uuid
 
     for fuuid, felem in features_by_type['TaxiwayElement'].items():
         collected[fuuid] = ('TaxiwayElement', felem)
-        twy_uuid = get_ref_uuid(felem, 'associatedTaxiway')
+        twy_uuid = refs[fuuid].get('associatedTaxiway')
         if twy_uuid:
             ahp_uuid = taxiway_to_airport.get(twy_uuid)
             if ahp_uuid:
@@ -769,7 +866,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
     apron_to_airport = {}
     for fuuid, felem in features_by_type['Apron'].items():
         collected[fuuid] = ('Apron', felem)
-        ahp_uuid = get_ref_uuid(felem, 'associatedAirportHeliport')
+        ahp_uuid = refs[fuuid].get('associatedAirportHeliport')
         if ahp_uuid:
             apron_to_airport[fuuid] = ahp_uuid
             airport_membership[fuuid] = ahp_uuid
@@ -777,7 +874,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
     apronelem_to_apron = {}
     for fuuid, felem in features_by_type['ApronElement'].items():
         collected[fuuid] = ('ApronElement', felem)
-        apron_uuid = get_ref_uuid(felem, 'associatedApron')
+        apron_uuid = refs[fuuid].get('associatedApron')
         if apron_uuid:
             apronelem_to_apron[fuuid] = apron_uuid
             ahp_uuid = apron_to_airport.get(apron_uuid)
@@ -786,7 +883,7 @@ def collect_features(features_by_type, ase_types_exclude=None):
 
     for fuuid, felem in features_by_type['AircraftStand'].items():
         collected[fuuid] = ('AircraftStand', felem)
-        ae_uuid = get_ref_uuid(felem, 'apronLocation')
+        ae_uuid = refs[fuuid].get('apronLocation')
         if ae_uuid:
             apron_uuid = apronelem_to_apron.get(ae_uuid)
             if apron_uuid:
@@ -796,29 +893,24 @@ def collect_features(features_by_type, ase_types_exclude=None):
 
     for fuuid, felem in features_by_type['WorkArea'].items():
         collected[fuuid] = ('WorkArea', felem)
-        ahp_uuid = get_ref_uuid(felem, 'associatedAirportHeliport')
+        ahp_uuid = refs[fuuid].get('associatedAirportHeliport')
         if ahp_uuid:
             airport_membership[fuuid] = ahp_uuid
 
     # Navaids + their equipment references
-    for fuuid, felem in features_by_type['TouchDownLiftOff'].items():
-        ahp_uuid = get_ref_uuid(felem, 'associatedAirportHeliport')
-        if ahp_uuid:
-            tdlof_to_airport[fuuid] = ahp_uuid
-
     navaid_equipment = {}
     for fuuid, felem in features_by_type['Navaid'].items():
         if fuuid not in collected:
             collected[fuuid] = ('Navaid', felem)
-        ahp_uuid = get_ref_uuid(felem, 'servedAirport')
+        ahp_uuid = refs[fuuid].get('servedAirport')
         if not ahp_uuid:
-            rwydir_uuid = get_ref_uuid(felem, 'runwayDirection')
+            rwydir_uuid = refs[fuuid].get('runwayDirection')
             if rwydir_uuid:
                 rwy_uuid = rwydir_to_runway.get(rwydir_uuid)
                 if rwy_uuid:
                     ahp_uuid = runway_to_airport.get(rwy_uuid)
         if not ahp_uuid:
-            tdlof_uuid = get_ref_uuid(felem, 'touchDownLiftOff')
+            tdlof_uuid = refs[fuuid].get('touchDownLiftOff')
             if tdlof_uuid:
                 ahp_uuid = tdlof_to_airport.get(tdlof_uuid)
         if ahp_uuid:
@@ -934,22 +1026,20 @@ def spatial_filter(collected, airport_membership, navaid_equipment,
 
 
 def update_feature_ids(feature_elem, new_uuid):
+    """gml:id / gml:identifier of the feature -> new_uuid; its first TimeSlice
+    becomes id_<uuid>_<seq>_<corr>_B and every element with a gml:id inside it
+    id_<uuid>_<seq>_<corr>_B_<k>, numbered in document order."""
     feature_elem.set(GML_ID, f'uuid.{new_uuid}')
-    ident = feature_elem.find('gml:identifier', NSMAP)
+    ident = feature_elem.find(GML_IDENTIFIER)
     if ident is not None:
         ident.text = new_uuid
 
-    timeslice = None
-    for child in feature_elem.iter():
-        tag = child.tag
-        if isinstance(tag, str) and 'TimeSlice' in tag and child is not feature_elem:
-            timeslice = child
-            break
+    timeslice = get_first_timeslice(feature_elem)
     if timeslice is None:
         return
 
-    seq_elem = timeslice.find('aixm:sequenceNumber', NSMAP)
-    corr_elem = timeslice.find('aixm:correctionNumber', NSMAP)
+    seq_elem = timeslice.find(AIXM_SEQUENCE_NUMBER)
+    corr_elem = timeslice.find(AIXM_CORRECTION_NUMBER)
     seq = int(seq_elem.text) if seq_elem is not None and seq_elem.text else 1
     corr = int(corr_elem.text) if corr_elem is not None and corr_elem.text else 0
 
@@ -964,13 +1054,70 @@ def update_feature_ids(feature_elem, new_uuid):
             child_idx += 1
 
 
-def update_xlink_refs(feature_elem, uuid_map):
+def xlink_href_map(uuid_map):
+    """uuid_map (OLD -> NEW) as OLD -> 'urn:uuid:NEW', the ready-made
+    xlink:href value update_xlink_refs sets.  Built once per copy."""
+    return {old: 'urn:uuid:' + new for old, new in uuid_map.items()}
+
+
+def update_xlink_refs(feature_elem, href_map):
+    """Rewrite every xlink:href="urn:uuid:OLD" in the subtree whose OLD is a
+    key of href_map (see xlink_href_map)."""
     for elem in feature_elem.iter():
         href = elem.get(XLINK_HREF)
         if href and href.startswith('urn:uuid:'):
-            old_uuid = href.replace('urn:uuid:', '')
-            if old_uuid in uuid_map:
-                elem.set(XLINK_HREF, f'urn:uuid:{uuid_map[old_uuid]}')
+            new_href = href_map.get(href[len('urn:uuid:'):])
+            if new_href is not None:
+                elem.set(XLINK_HREF, new_href)
+
+
+# Compiled patterns per href attribute start (b' xlink:href="urn:uuid:' with
+# the prefix the source binds to the XLink namespace), as lxml serialises it:
+# one space before the attribute, double quotes.  The first pattern matches XML
+# comments too, so that commented-out references are skipped as they are by
+# update_xlink_refs.  Most features carry no comment at all; for those the
+# plain pattern is used, which lets re scan for its literal prefix instead of
+# trying the alternation at every byte (about twice as fast).
+_XLINK_URN_PATTERNS = {}
+
+
+def _xlink_urn_patterns(href_attr):
+    patterns = _XLINK_URN_PATTERNS.get(href_attr)
+    if patterns is None:
+        ref = re.escape(href_attr) + rb'([^"]*)"'
+        patterns = (re.compile(rb'<!--.*?-->|' + ref, re.S), re.compile(ref))
+        _XLINK_URN_PATTERNS[href_attr] = patterns
+    return patterns
+
+
+def xlink_href_attr(feature_elem, data):
+    """The start of feature_elem's urn:uuid: references in data (its
+    serialisation), b' PREFIX:href="urn:uuid:' with the prefix its namespace
+    map binds to XLink, for update_xlink_refs_bytes.  Returns None when the
+    byte-level rewrite would not hit exactly the references update_xlink_refs
+    rewrites (no single XLink prefix, XLink bound again deeper in the feature,
+    the attribute text appearing elsewhere), so the caller uses the tree."""
+    prefixes = [p for p, uri in feature_elem.nsmap.items()
+                if uri == NSMAP['xlink'] and p]
+    prefix = prefixes[0] if len(prefixes) == 1 else 'xlink'
+    href_attr = f' {prefix}:href="urn:uuid:'.encode()
+    n_refs = sum(1 for elem in feature_elem.iter()
+                 if (elem.get(XLINK_HREF) or '').startswith('urn:uuid:'))
+    n_matches = sum(1 for m in _xlink_urn_patterns(href_attr)[0].finditer(data)
+                    if m.group(1) is not None)
+    return href_attr if len(prefixes) <= 1 and n_matches == n_refs else None
+
+
+def update_xlink_refs_bytes(data, href_attr, href_map_bytes):
+    """Byte-level update_xlink_refs on a serialised feature: rewrite every
+    reference starting with href_attr (see xlink_href_attr) whose OLD UUID is a
+    key of href_map_bytes, without building the element tree.  href_map_bytes
+    maps OLD to the whole replacement attribute, href_attr + b'NEW"'."""
+    def sub(m):
+        return href_map_bytes.get(m.group(1)) or m.group(0)
+    with_comments, plain = _xlink_urn_patterns(href_attr)
+    pattern = with_comments if b'<!--' in data else plain
+    return pattern.sub(sub, data)
 
 
 def replace_uuid_everywhere(elem, uuid_map):
@@ -1047,15 +1194,25 @@ def _mercator_inverse_y(y):
     return math.degrees(phi)
 
 
+def _split_coordinate_text(text):
+    """Split a gml:pos / gml:posList text node into (tokens, value_idx): tokens
+    alternates values and whitespace runs, so ''.join(tokens) gives the text
+    back exactly, and value_idx indexes the values of the complete pairs (a
+    trailing unpaired value is left out)."""
+    tokens = re.split(r'(\s+)', text)
+    value_idx = [i for i, t in enumerate(tokens) if t and not t.isspace()]
+    del value_idx[len(value_idx) - len(value_idx) % 2:]
+    return tokens, value_idx
+
+
 def _map_coordinate_pairs(text, pair_fn):
     """Apply pair_fn(first_str, second_str) -> (new_first, new_second) to every
     consecutive value pair of a gml:pos / gml:posList text node while leaving
     every whitespace run (line breaks, hanging indentation, leading/trailing
     spaces) exactly as it is in the source.  pair_fn returns None to keep a pair
     unchanged (non-numeric values)."""
-    tokens = re.split(r'(\s+)', text)
-    value_idx = [i for i, t in enumerate(tokens) if t and not t.isspace()]
-    for j in range(0, len(value_idx) - 1, 2):
+    tokens, value_idx = _split_coordinate_text(text)
+    for j in range(0, len(value_idx), 2):
         i1, i2 = value_idx[j], value_idx[j + 1]
         new_pair = pair_fn(tokens[i1], tokens[i2])
         if new_pair is not None:
@@ -1063,31 +1220,54 @@ def _map_coordinate_pairs(text, pair_fn):
     return ''.join(tokens)
 
 
-def offset_coordinate(coord_str, lat_offset, lon_offset):
-    def pair(lat_s, lon_s):
-        try:
-            return f"{float(lat_s) + lat_offset}", f"{float(lon_s) + lon_offset}"
-        except ValueError:
-            return None
-    return _map_coordinate_pairs(coord_str, pair)
-
-
-def offset_pos_list(pos_list_str, lat_offset, lon_offset):
-    return offset_coordinate(pos_list_str, lat_offset, lon_offset)
-
-
-def offset_mercator_pos_list(pos_list_str, lat_offset, lon_offset):
-    delta_x = _MERCATOR_A * math.radians(lon_offset)
-
-    def pair(x_s, y_s):
+def _map_coordinate_texts(texts, values_fn):
+    """Vectorised form of _map_coordinate_pairs over several gml:pos /
+    gml:posList texts: the values of all of them are parsed into one flat
+    float64 array and values_fn(lats, lons) returns the new (lats, lons) for
+    every pair at once, so it runs once per batch rather than once per text.
+    Every text keeps an even value count, so the lat/lon stride of the flat
+    array stays aligned.  Whitespace runs are kept exactly as in the source
+    and each value is written back in the same shortest round-trip form
+    f"{value}" gives.  Returns the new texts, or None if any value is not
+    numeric, so the caller can fall back to the per-pair path (which leaves
+    only the offending pairs unchanged)."""
+    parsed = []
+    strings = []
+    for text in texts:
+        tokens, value_idx = _split_coordinate_text(text)
+        parsed.append((tokens, value_idx))
+        strings.extend(tokens[i] for i in value_idx)
+    if strings:
         try:
-            x, y = float(x_s), float(y_s)
+            values = np.array(strings, dtype=np.float64)
         except ValueError:
             return None
-        lat = _mercator_inverse_y(y)
-        new_y = _mercator_forward_y(lat + lat_offset)
-        return f"{x + delta_x:.2f}", f"{new_y:.2f}"
-    return _map_coordinate_pairs(pos_list_str, pair)
+        values[0::2], values[1::2] = values_fn(values[0::2], values[1::2])
+        flat = iter(values.tolist())
+        for tokens, value_idx in parsed:
+            for i in value_idx:
+                tokens[i] = repr(next(flat))
+    return [''.join(tokens) for tokens, _value_idx in parsed]
+
+
+def _map_coordinate_values(text, values_fn):
+    """_map_coordinate_texts for a single text; None if a value is not
+    numeric."""
+    texts = _map_coordinate_texts([text], values_fn)
+    return None if texts is None else texts[0]
+
+
+def _map_coordinate_nodes(nodes, values_fn):
+    """_map_coordinate_texts over the text of several gml:pos / gml:posList
+    elements, so values_fn runs once per feature rather than once per
+    element.  Returns False (and changes nothing) if any value is not numeric,
+    so the caller can fall back to the per-element path."""
+    texts = _map_coordinate_texts([node.text for node in nodes], values_fn)
+    if texts is None:
+        return False
+    for node, text in zip(nodes, texts):
+        node.text = text
+    return True
 
 
 def _find_ancestor_srs(parent_map, elem):
@@ -1100,21 +1280,6 @@ def _find_ancestor_srs(parent_map, elem):
     return None
 
 
-def offset_all_coordinates(feature_elem, lat_offset, lon_offset):
-    parent_map = {child: parent for parent in feature_elem.iter() for child in parent}
-    for pos in feature_elem.iter(GML_POS):
-        if pos.text and pos.text.strip():
-            pos.text = offset_coordinate(pos.text, lat_offset, lon_offset)
-    for pos_list in feature_elem.iter(GML_POSLIST):
-        if not (pos_list.text and pos_list.text.strip()):
-            continue
-        srs = _find_ancestor_srs(parent_map, pos_list)
-        if srs and 'EPSG::3395' in srs:
-            pos_list.text = offset_mercator_pos_list(pos_list.text, lat_offset, lon_offset)
-        else:
-            pos_list.text = offset_pos_list(pos_list.text, lat_offset, lon_offset)
-
-
 # -- latitude-offset + longitude-scale transform ----------------------------
 # Placing a copy at a different latitude with a plain degree translation would
 # distort its east-west ground width, because 1 deg of longitude = 60*cos(lat)
@@ -1129,22 +1294,29 @@ def offset_all_coordinates(feature_elem, lat_offset, lon_offset):
 # source's east-west ground width (lon-extent * cos(anchor_lat)).
 
 
+def scene_transform(anchor_lon, target_lon, lat_offset, lon_scale):
+    """The transform above as a function (lat, lon) -> (lat', lon'), used alike
+    on floats and on NumPy arrays of values."""
+    def transform(lat, lon):
+        return lat + lat_offset, target_lon + (lon - anchor_lon) * lon_scale
+    return transform
+
+
 def transform_coordinate(coord_str, anchor_lon, target_lon, lat_offset, lon_scale):
+    transform = scene_transform(anchor_lon, target_lon, lat_offset, lon_scale)
+    text = _map_coordinate_values(coord_str, transform)
+    if text is not None:
+        return text
+
     def pair(lat_s, lon_s):
         try:
-            lat = float(lat_s) + lat_offset
-            lon = target_lon + (float(lon_s) - anchor_lon) * lon_scale
+            lat, lon = transform(float(lat_s), float(lon_s))
             return f"{lat}", f"{lon}"
         except ValueError:
             return None
     return _map_coordinate_pairs(coord_str, pair)
 
 
-def transform_pos_list(pos_list_str, anchor_lon, target_lon, lat_offset, lon_scale):
-    return transform_coordinate(
-        pos_list_str, anchor_lon, target_lon, lat_offset, lon_scale)
-
-
 def transform_mercator_pos_list(pos_list_str, anchor_lon, target_lon, lat_offset,
                                 lon_scale):
     def pair(x_s, y_s):
@@ -1162,12 +1334,13 @@ def transform_mercator_pos_list(pos_list_str, anchor_lon, target_lon, lat_offset
 
 
 def transform_all_coordinates(feature_elem, anchor_lon, target_lon, lat_offset, lon_scale):
-    """Offset latitude and scale longitude about the anchor (see note above)."""
+    """Offset latitude and scale longitude about the anchor (see note above).
+
+    All EPSG:4326 gml:pos / gml:posList values of the feature are transformed
+    together in one vectorised pass; World Mercator lists go pair by pair."""
     parent_map = {child: parent for parent in feature_elem.iter() for child in parent}
-    for pos in feature_elem.iter(GML_POS):
-        if pos.text and pos.text.strip():
-            pos.text = transform_coordinate(
-                pos.text, anchor_lon, target_lon, lat_offset, lon_scale)
+    geographic = [pos for pos in feature_elem.iter(GML_POS)
+                  if pos.text and pos.text.strip()]
     for pos_list in feature_elem.iter(GML_POSLIST):
         if not (pos_list.text and pos_list.text.strip()):
             continue
@@ -1176,61 +1349,147 @@ def transform_all_coordinates(feature_elem, anchor_lon, target_lon, lat_offset,
             pos_list.text = transform_mercator_pos_list(
                 pos_list.text, anchor_lon, target_lon, lat_offset, lon_scale)
         else:
-            pos_list.text = transform_pos_list(
-                pos_list.text, anchor_lon, target_lon, lat_offset, lon_scale)
+            geographic.append(pos_list)
+    _transform_geographic_nodes(geographic, anchor_lon, target_lon, lat_offset, lon_scale)
+
+
+def _transform_geographic_nodes(nodes, anchor_lon, target_lon, lat_offset, lon_scale):
+    """Transform the EPSG:4326 text of the given gml:pos / gml:posList elements
+    in one vectorised pass (per element if a value is not numeric)."""
+    transform = scene_transform(anchor_lon, target_lon, lat_offset, lon_scale)
+    if not _map_coordinate_nodes(nodes, transform):
+        for node in nodes:
+            node.text = transform_coordinate(
+                node.text, anchor_lon, target_lon, lat_offset, lon_scale)
 
 
-def clone_feature_set(collected_features, airport_membership, index,
-                      anchor_lat, anchor_lon, target_lat, target_lon,
+def rewrite_cloned_feature(feature_elem, anchor_lon, target_lon, lat_offset,
+                           lon_scale, begin_position=None):
+    """Move a freshly cloned feature and set its begin position in a single walk
+    of its subtree (its identity is already in the serialised template, see
+    serialize_features):
+
+      - gml:pos / gml:posList: the scene transform of transform_all_coordinates
+        (the srsName in effect is tracked on the way down);
+      - every gml:beginPosition inside a TimeSlice -> begin_position, if given.
+    """
+    ts_depth = 0
+    srs_stack = [None]
+    geographic = []
+    for event, elem in etree.iterwalk(feature_elem, events=('start', 'end')):
+        tag = elem.tag
+        is_ts = 'TimeSlice' in tag and elem is not feature_elem
+        if event == 'end':
+            srs_stack.pop()
+            if is_ts:
+                ts_depth -= 1
+            continue
+        srs_stack.append(elem.get('srsName') or srs_stack[-1])
+
+        if is_ts:
+            ts_depth += 1
+        elif tag == GML_POS:
+            if elem.text and elem.text.strip():
+                geographic.append(elem)
+        elif tag == GML_POSLIST:
+            if elem.text and elem.text.strip():
+                srs = srs_stack[-1]
+                if srs and 'EPSG::3395' in srs:
+                    elem.text = transform_mercator_pos_list(
+                        elem.text, anchor_lon, target_lon, lat_offset, lon_scale)
+                else:
+                    geographic.append(elem)
+        elif tag == GML_BEGIN_POSITION and ts_depth and begin_position is not None:
+            elem.text = begin_position
+    _transform_geographic_nodes(geographic, anchor_lon, target_lon, lat_offset, lon_scale)
+
+
+def serialize_features(collected_features):
+    """Serialise every selected feature once, for clone_feature_set.
+
+    Returns {uuid: (type_name, xml_bytes, tail, placeholder, href_attr)}.
+    Re-parsing the
+    bytes gives a fresh, parentless copy of the feature for each copy (cheaper
+    than a deepcopy of the live tree, and picklable for the worker processes);
+    the source tail is kept apart because a parsed root element carries none.
+
+    The bytes already carry the clone's identity (update_feature_ids) with a
+    random placeholder UUID in place of the new one, so a copy only has to
+    substitute its new UUID for the placeholder on the bytes.  The TimeSlice
+    gml:id numbering depends on the source structure alone, so it is done here
+    once rather than on every copy's tree.  href_attr is xlink_href_attr of the
+    feature: the XLink prefix its references are rewritten with on the bytes,
+    or None to rewrite them on the parsed tree."""
+    serialized = {}
+    for fuuid, (ftype, felem) in collected_features.items():
+        template = etree.fromstring(
+            etree.tostring(felem, encoding='UTF-8', with_tail=False))
+        placeholder = generate_new_uuid()
+        update_feature_ids(template, placeholder)
+        data = etree.tostring(template, encoding='UTF-8')
+        serialized[fuuid] = (ftype, data, felem.tail, placeholder.encode(),
+                             xlink_href_attr(template, data))
+    return serialized
+
+
+def clone_feature_set(serialized_features, airport_membership, index,
+                      anchor_lon, target_lon, lat_offset, lon_scale,
                       begin_position=None):
     """
     Clone the whole selected feature set for one copy, moving the scene from the
     anchor (TMA centroid) to the target grid cell: latitude is offset and
     longitude is scaled about the anchor by cos(anchor_lat)/cos(target_lat) so
     the copy keeps the source's true east-west ground width at its new latitude
-    (see transform_all_coordinates).
+    (see transform_all_coordinates).  lat_offset and lon_scale are the cell's,
+    precomputed for the whole grid by grid_transforms.
+
+    serialized_features is the output of serialize_features.
 
     Returns (cloned, new_membership, airport_names, uuid_map) where cloned is a
     list of (type_name, element, new_uuid).
     """
-    lat_offset = target_lat - anchor_lat
-    cos_target = math.cos(math.radians(target_lat))
-    lon_scale = (math.cos(math.radians(anchor_lat)) / cos_target
-                 if abs(cos_target) > 1e-6 else 1.0)
-
-    uuid_map = {old_uuid: generate_new_uuid() for old_uuid in collected_features}
+    uuid_map = dict(zip(serialized_features, generate_new_uuids(len(serialized_features))))
+    # href attribute start -> {OLD: whole replacement attribute}, built once per
+    # copy (per XLink prefix in use) rather than per hit; None -> the
+    # xlink_href_map for features rewritten on the tree.
+    href_maps = {}
 
     cloned = []
-    for old_uuid, (feat_type, orig_elem) in collected_features.items():
-        new_elem = copy.deepcopy(orig_elem)
+    for old_uuid, feature in serialized_features.items():
+        feat_type, data, tail, placeholder, href_attr = feature
         new_uuid = uuid_map[old_uuid]
+        data = data.replace(placeholder, new_uuid.encode())
+        href_map = href_maps.get(href_attr)
+        if href_map is None:
+            if href_attr is None:
+                href_map = xlink_href_map(uuid_map)
+            else:
+                href_map = {old.encode(): href_attr + new.encode() + b'"'
+                            for old, new in uuid_map.items()}
+            href_maps[href_attr] = href_map
+        if href_attr is None:
+            new_elem = etree.fromstring(data)
+            update_xlink_refs(new_elem, href_map)
+        else:
+            new_elem = etree.fromstring(update_xlink_refs_bytes(data, href_attr, href_map))
+        new_elem.tail = tail
 
-        update_feature_ids(new_elem, new_uuid)
-        update_xlink_refs(new_elem, uuid_map)
-        transform_all_coordinates(
-            new_elem, anchor_lon, target_lon, lat_offset, lon_scale)
-
-        if begin_position is not None:
-            update_valid_time(new_elem, begin_position)
+        rewrite_cloned_feature(new_elem, anchor_lon, target_lon,
+                               lat_offset, lon_scale, begin_position)
 
         if feat_type == 'AirportHeliport':
-            ts = None
-            for child in new_elem.iter():
-                tag = child.tag
-                if isinstance(tag, str) and 'AirportHeliportTimeSlice' in tag:
-                    ts = child
-                    break
+            ts = get_first_timeslice(new_elem)
             if ts is not None:
-                n = ts.find('aixm:name', NSMAP)
+                n = ts.find(AIXM_NAME)
                 original_name = n.text if (n is not None and n.text) else None
                 prefix = get_airport_designator_prefix(original_name)
-                d = ts.find('aixm:designator', NSMAP)
+                d = ts.find(AIXM_DESIGNATOR)
                 if d is not None and d.text and len(d.text) >= 2:
                     if prefix:
                         d.text = f"{prefix}{chr(ord('A') + index)}"
                     else:
                         d.text = f"{d.text[:-1]}{chr(ord('A') + index)}"
-                    li = ts.find('aixm:locationIndicatorICAO', NSMAP)
+                    li = ts.find(AIXM_LOCATION_INDICATOR_ICAO)
                     if li is not None and li.text and li.text.strip():
                         li.text = d.text
                 if n is not None and n.text:
@@ -1245,69 +1504,56 @@ def clone_feature_set(collected_features, airport_membership, index,
                     asrc.set(xsi_nil, 'true')
                     record_excluded_ref('AirportHeliport', 'altimeterSource')
 
-        if feat_type in ('Navaid', *NAVAID_EQUIPMENT_TYPES):
+        if feat_type in NAVAID_AND_EQUIPMENT_TYPES:
             suffix = f"-{index + 1:02d}"
-            for child in new_elem.iter():
-                tag = child.tag
-                if isinstance(tag, str) and 'TimeSlice' in tag and child is not new_elem:
-                    n = child.find('aixm:name', NSMAP)
-                    if n is not None and n.text:
-                        n.text = n.text + suffix
-                    break
+            ts = get_first_timeslice(new_elem)
+            if ts is not None:
+                n = ts.find(AIXM_NAME)
+                if n is not None and n.text:
+                    n.text = n.text + suffix
 
         if feat_type == 'AeronauticalGroundLight':
             suffix = f"-{index + 1:02d}"
-            for child in new_elem.iter():
-                tag = child.tag
-                if isinstance(tag, str) and 'TimeSlice' in tag and child is not new_elem:
-                    n = child.find('aixm:name', NSMAP)
-                    if n is not None and n.text:
-                        n.text = n.text + suffix
-                    break
+            ts = get_first_timeslice(new_elem)
+            if ts is not None:
+                n = ts.find(AIXM_NAME)
+                if n is not None and n.text:
+                    n.text = n.text + suffix
 
         if feat_type == 'VerticalStructure':
             suffix = f"-{index + 1:02d}"
-            for child in new_elem.iter():
-                tag = child.tag
-                if isinstance(tag, str) and 'TimeSlice' in tag and child is not new_elem:
-                    n = child.find('aixm:name', NSMAP)
-                    if n is not None and n.text:
-                        n.text = n.text + suffix
-                    for part_elem in child.iter(
-                            '{http://www.aixm.aero/schema/5.1.1}VerticalStructurePart'):
-                        pd = part_elem.find('aixm:designator', NSMAP)
-                        if pd is not None and pd.text and pd.text.strip():
-                            xsi_nil = pd.get('{http://www.w3.org/2001/XMLSchema-instance}nil')
-                            if not xsi_nil:
-                                parts = pd.text.split('-')
-                                parts = [p.lstrip('0') or p for p in parts]
-                                pd.text = '-'.join(parts) + suffix
-                    for prop_name in VS_PROPERTIES_TO_REMOVE:
-                        for prop_elem in list(child.findall(f'aixm:{prop_name}', NSMAP)):
-                            child.remove(prop_elem)
-                    break
+            ts = get_first_timeslice(new_elem)
+            if ts is not None:
+                n = ts.find(AIXM_NAME)
+                if n is not None and n.text:
+                    n.text = n.text + suffix
+                for pd in _VS_PART_DESIGNATORS(ts):
+                    if pd.text and pd.text.strip():
+                        parts = pd.text.split('-')
+                        parts = [p.lstrip('0') or p for p in parts]
+                        pd.text = '-'.join(parts) + suffix
+                for prop_elem in _VS_REMOVED_PROPERTIES(ts):
+                    ts.remove(prop_elem)
 
         if feat_type == 'Airspace':
             copy_suffix = f"-{index + 1:02d}"
-            for child in new_elem.iter():
-                tag = child.tag
-                if isinstance(tag, str) and 'TimeSlice' in tag and child is not new_elem:
-                    d = child.find('aixm:designator', NSMAP)
-                    if d is not None and d.text:
-                        d.text = d.text + copy_suffix
-                    n = child.find('aixm:name', NSMAP)
-                    if n is not None and n.text:
-                        n.text = n.text + f" {index + 1:02d}"
-                    di = child.find('aixm:designatorICAO', NSMAP)
-                    if di is not None:
-                        di.text = 'NO'
-                        for attr in (
-                            '{http://www.w3.org/2001/XMLSchema-instance}nil',
-                            'nilReason',
-                        ):
-                            if attr in di.attrib:
-                                del di.attrib[attr]
-                    break
+            ts = get_first_timeslice(new_elem)
+            if ts is not None:
+                d = ts.find(AIXM_DESIGNATOR)
+                if d is not None and d.text:
+                    d.text = d.text + copy_suffix
+                n = ts.find(AIXM_NAME)
+                if n is not None and n.text:
+                    n.text = n.text + f" {index + 1:02d}"
+                di = ts.find(AIXM_DESIGNATOR_ICAO)
+                if di is not None:
+                    di.text = 'NO'
+                    for attr in (
+                        '{http://www.w3.org/2001/XMLSchema-instance}nil',
+                        'nilReason',
+                    ):
+                        if attr in di.attrib:
+                            del di.attrib[attr]
 
         if feat_type == 'ApronElement':
             xsi_nil = '{http://www.w3.org/2001/XMLSchema-instance}nil'
@@ -1373,7 +1619,7 @@ def create_output_document(features, gml_id='Generated_Features', comment=None):
     Only the whitespace of the new wrapper structure (root / message:hasMember)
     is set here; the feature elements are emitted with the exact indentation
     they carry from the source file (annotations, geometry coordinate lists,
-    ...), which deepcopy preserved."""
+    ...), which cloning preserved."""
     root = etree.Element(
         '{http://www.aixm.aero/schema/5.1.1/message}AIXMBasicMessage',
         nsmap=OUTPUT_NSMAP,
@@ -1414,18 +1660,19 @@ _HEADER_RE = re.compile(
 _ATTR_RE = re.compile(r'(\S+?="[^"]*")')
 
 
-def _format_root_header(path):
-    with open(path, encoding='utf-8') as f:
-        text = f.read()
+def _format_root_header_text(text):
+    """Return text with its XML declaration and AIXMBasicMessage start tag
+    reformatted to the source style (one attribute per line); unchanged if the
+    header is not recognised."""
     m = _HEADER_RE.match(text)
     if not m:
-        return
+        return text
     xml_decl, comment, open_tag, attrs_blob = m.groups()
     # lxml emits the declaration with single quotes; match the source style.
     xml_decl = '<?xml version="1.0" encoding="UTF-8"?>'
     attrs = _ATTR_RE.findall(attrs_blob)
     if not attrs:
-        return
+        return text
     formatted = []
     for a in attrs:
         if a.startswith('xsi:schemaLocation='):
@@ -1439,14 +1686,60 @@ def _format_root_header(path):
     if comment:
         header += f'{comment}\n'
     header += f'{open_tag} \n  ' + ' \n  '.join(formatted) + '>'
-    new_text = header + text[m.end():]
-    with open(path, 'w', encoding='utf-8', newline='\n') as f:
-        f.write(new_text)
+    return header + text[m.end():]
+
+
+def serialize_xml(tree):
+    """The file content write_xml writes for tree: serialised in memory with the
+    root header reformatted.  No pretty-printing: every element already carries
+    the source whitespace, which is emitted verbatim."""
+    text = etree.tostring(tree, encoding='UTF-8', xml_declaration=True).decode('utf-8')
+    return _format_root_header_text(text).encode('utf-8')
+
+
+def _write_bytes(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
 
 
 def write_xml(tree, path):
-    tree.write(path, encoding='UTF-8', xml_declaration=True, pretty_print=False)
-    _format_root_header(path)
+    _write_bytes(path, serialize_xml(tree))
+
+
+_OUTPUT_ROOT_END = '</message:AIXMBasicMessage>'
+
+
+def serialize_members(features):
+    """Serialise the message:hasMember elements create_output_document(features)
+    would hold, back to back with the document's separator between them, as one
+    chunk for write_streamed_document.  Returns b'' for no features."""
+    if not features:
+        return b''
+    doc = etree.tostring(create_output_document(features), encoding='UTF-8')
+    start = doc.index(b'>', doc.index(b'<message:AIXMBasicMessage')) + 1
+    end = doc.rindex(_OUTPUT_ROOT_END.encode())
+    # Drop the root's leading "\n  " and the last member's "\n" tail.
+    return doc[start + 3:end - 1]
+
+
+def write_streamed_document(path, member_chunks, gml_id, comment=None):
+    """Write the document create_output_document + write_xml would produce for
+    the features behind member_chunks (see serialize_members), streaming each
+    chunk to the file instead of assembling the combined tree in memory."""
+    tree = create_output_document([], gml_id=gml_id, comment=comment)
+    tree.getroot().text = '\n'
+    text = _format_root_header_text(etree.tostring(
+        tree, encoding='UTF-8', xml_declaration=True).decode('utf-8'))
+    header, _, footer = text.partition(_OUTPUT_ROOT_END)
+    with open(path, 'wb') as f:
+        sep = b'\n  '
+        f.write(header[:-1].encode('utf-8'))
+        for chunk in member_chunks:
+            if chunk:
+                f.write(sep)
+                f.write(chunk)
+                sep = b'\n  '
+        f.write(b'\n' + (_OUTPUT_ROOT_END + footer).encode('utf-8'))
 
 
 def write_organisation_authorities(root, out_dir, begin_position=None,
@@ -1468,8 +1761,8 @@ def write_organisation_authorities(root, out_dir, begin_position=None,
     """
     exclude_uuids = exclude_uuids or set()
     feats = []
-    for member in root.findall('message:hasMember', NSMAP):
-        oa = member.find('aixm:OrganisationAuthority', NSMAP)
+    for member in root.findall(MSG_NS + 'hasMember'):
+        oa = member.find(AIXM_NS + 'OrganisationAuthority')
         if oa is None:
             continue
         oa_uuid = get_feature_uuid(oa)
@@ -1514,7 +1807,7 @@ def _sync_begin_positions(ts, vt_begin, fl_begin, date_map=None):
     None values are left untouched.  When date_map is given, record the replaced
     original date -> new date so the same change can be mirrored in the leading
     scenario comment."""
-    seq = ts.find('aixm:sequenceNumber', NSMAP)
+    seq = ts.find(AIXM_SEQUENCE_NUMBER)
     is_seq1 = seq is not None and seq.text and seq.text.strip() == '1'
 
     if vt_begin is not None and is_seq1:
@@ -1575,7 +1868,7 @@ def _collect_remaining_date_elems(feat):
         tag = ts.tag
         if not (isinstance(tag, str) and 'TimeSlice' in tag and ts is not feat):
             continue
-        seq_elem = ts.find('aixm:sequenceNumber', NSMAP)
+        seq_elem = ts.find(AIXM_SEQUENCE_NUMBER)
         try:
             seq = int(seq_elem.text) if seq_elem is not None and seq_elem.text else None
         except ValueError:
@@ -1703,16 +1996,19 @@ def write_temporality_cases(template_dir, copy_dir, copy_num, uuid_map,
     the copy's start date, and every feature's original UUID is replaced with its
     per-copy UUID (e.g. the WorkArea UUID quoted in the work-area scenarios).
 
-    Returns (files_written, warnings) where warnings is a list of
-    (template_filename, original_uuid) for features that have no clone.
+    Returns (files_written, warnings, unmapped_dates) where warnings is a list
+    of (template_filename, original_uuid) for features that have no clone and
+    unmapped_dates the sorted original dates not in
+    TEMPORALITY_DATE_CONVERSIONS (shifted by TEMPORALITY_DATE_SHIFT_DAYS
+    instead).
     """
     if not template_dir or not os.path.isdir(template_dir):
-        return 0, []
+        return 0, [], []
 
     templates = sorted(f for f in os.listdir(template_dir)
                        if f.lower().endswith('.xml'))
     if not templates:
-        return 0, []
+        return 0, [], []
 
     out_dir = os.path.join(copy_dir, f'{TEMPORALITY_OUTPUT_DIRNAME}_{copy_num:02d}')
     os.makedirs(out_dir, exist_ok=True)
@@ -1724,6 +2020,9 @@ def write_temporality_cases(template_dir, copy_dir, copy_num, uuid_map,
     # before the Decommissioning_..._Committed_Baseline.xml that updates it.
     shared_new_uuids = {}
 
+    # Per-copy xlink:href values, formatted once for all templates.
+    href_map = xlink_href_map(uuid_map)
+
     warnings = []
 
     # --- Phase 1: transform every template's body, deferring the date
@@ -1758,7 +2057,7 @@ def write_temporality_cases(template_dir, copy_dir, copy_num, uuid_map,
         comment_remap = {}  # original feature UUID -> per-copy UUID (for the comment)
         remaining_elems = []  # (element, datetime) whose shift is deferred to phase 2
 
-        for member in root.findall('message:hasMember', NSMAP):
+        for member in root.findall(MSG_NS + 'hasMember'):
             feat = _find_member_feature(member)
             if feat is None:
                 continue
@@ -1780,10 +2079,10 @@ def write_temporality_cases(template_dir, copy_dir, copy_num, uuid_map,
                 copy_begin.  The remaining dates are collected for the per-scenario
                 conversion in phase 2."""
                 feat.set(GML_ID, f'uuid.{new_uuid}')
-                ident = feat.find('gml:identifier', NSMAP)
+                ident = feat.find(GML_IDENTIFIER)
                 if ident is not None:
                     ident.text = new_uuid
-                update_xlink_refs(feat, uuid_map)
+                update_xlink_refs(feat, href_map)
                 for ts in feat.iter():
                     tag = ts.tag
                     if isinstance(tag, str) and 'TimeSlice' in tag and ts is not feat:
@@ -1817,13 +2116,13 @@ def write_temporality_cases(template_dir, copy_dir, copy_num, uuid_map,
 
             # 1. Remap the feature's own identity to the per-copy clone.
             feat.set(GML_ID, f'uuid.{new_uuid}')
-            ident = feat.find('gml:identifier', NSMAP)
+            ident = feat.find(GML_IDENTIFIER)
             if ident is not None:
                 ident.text = new_uuid
             comment_remap[old_uuid] = new_uuid
 
             # 2. Remap every xlink:href urn:uuid: reference.
-            update_xlink_refs(feat, uuid_map)
+            update_xlink_refs(feat, href_map)
 
             # 3. Values to mirror from the clone.
             new_name = get_feature_name(clone_elem)
@@ -1836,11 +2135,11 @@ def write_temporality_cases(template_dir, copy_dir, copy_num, uuid_map,
                 if not (isinstance(tag, str) and 'TimeSlice' in tag and ts is not feat):
                     continue
                 if new_name is not None:
-                    n = ts.find('aixm:name', NSMAP)
+                    n = ts.find(AIXM_NAME)
                     if n is not None and n.text:
                         n.text = new_name
                 if new_desig is not None:
-                    d = ts.find('aixm:designator', NSMAP)
+                    d = ts.find(AIXM_DESIGNATOR)
                     if d is not None and d.text:
                         d.text = new_desig
                 _sync_begin_positions(ts, vt_begin, fl_begin, date_map)
@@ -1923,12 +2222,164 @@ def write_temporality_cases(template_dir, copy_dir, copy_num, uuid_map,
                 fh.write(out_text)
             written += 1
 
-    if unmapped_dates:
-        print(f"  NOTE: temporality date(s) not in TEMPORALITY_DATE_CONVERSIONS "
-              f"(shifted +{TEMPORALITY_DATE_SHIFT_DAYS} days instead): "
-              f"{', '.join(sorted(unmapped_dates))}")
+    return written, warnings, sorted(unmapped_dates)
 
-    return written, warnings
+
+# ---------------------------------------------------------------------------
+# Per-copy generation (parallel worker processes)
+# ---------------------------------------------------------------------------
+
+# Feature types that always go to a copy's Common_NN folder, and the airport
+# related types that go under their owning airport's folder (or Common_NN when
+# they have no airport).
+COMMON_ONLY_TYPES = {
+    'VerticalStructure', 'Airspace', 'DesignatedPoint', 'AeronauticalGroundLight',
+    'Navaid', 'VOR', 'DME', 'NDB', 'TACAN', 'Localizer', 'Glidepath', 'MarkerBeacon',
+}
+AIRPORT_OR_COMMON_TYPES = {
+    'AirportHeliport', 'Runway', 'RunwayDirection', 'RunwayElement',
+    'RunwayCentrelinePoint', 'TouchDownLiftOff', 'Taxiway', 'TaxiwayElement',
+    'Apron', 'ApronElement', 'AircraftStand', 'WorkArea',
+}
+
+# Threads writing a copy's files while the next document is being built.
+COPY_WRITE_THREADS = 4
+
+# Inputs shared by every copy, installed once per process by _init_copy_worker
+# (the pool initializer, or called by main() itself when running serially) so
+# that each task only carries its own grid cell.
+_COPY_WORKER = {}
+
+
+def _init_copy_worker(serialized_kept, settings):
+    """Pool initializer: install the serialised selected features (see
+    serialize_features) and the shared settings once per worker process."""
+    _COPY_WORKER.clear()
+    _COPY_WORKER.update(settings, kept=serialized_kept)
+
+
+def write_copy_folder(out_dir, copy_num, copy_features, new_membership, airport_names):
+    """Write one copy's Donlon_Copy_NN folder: the per-type files of Common_NN,
+    one folder per airport with its related features, and the per-copy
+    Donlon_ALL_Baseline_NN.xml.  Returns (copy_dir, airport_folder_count).
+
+    Each document is serialised here as soon as it is built (the per-copy ALL
+    document takes its elements over afterwards); the file writes go to a small
+    thread pool so the disk I/O overlaps with building the next document."""
+    copy_dir = os.path.join(out_dir, f'Donlon_Copy_{copy_num:02d}')
+    os.makedirs(copy_dir, exist_ok=True)
+
+    common_features = []
+    airport_features = {}
+    for feat_type, elem, new_uuid in copy_features:
+        if feat_type in COMMON_ONLY_TYPES:
+            common_features.append((feat_type, elem, new_uuid))
+        elif feat_type in AIRPORT_OR_COMMON_TYPES:
+            ahp_uuid = new_membership.get(new_uuid)
+            if ahp_uuid:
+                airport_features.setdefault(ahp_uuid, []).append(
+                    (feat_type, elem, new_uuid))
+            else:
+                common_features.append((feat_type, elem, new_uuid))
+
+    with ThreadPoolExecutor(max_workers=COPY_WRITE_THREADS) as pool:
+        writes = []
+        common_dir = os.path.join(copy_dir, f'Common_{copy_num:02d}')
+        os.makedirs(common_dir, exist_ok=True)
+        common_by_type = {}
+        for feat_type, elem, new_uuid in common_features:
+            common_by_type.setdefault(feat_type, []).append((feat_type, elem, new_uuid))
+        for feat_type, feat_list in common_by_type.items():
+            fpath = os.path.join(common_dir, f'{feat_type}_{copy_num:02d}.xml')
+            doc = create_output_document(
+                feat_list, gml_id=f'{feat_type}_Copy_{copy_num:02d}',
+                comment=f'{feat_type} features - Copy {copy_num:02d}')
+            writes.append(pool.submit(_write_bytes, fpath, serialize_xml(doc)))
+
+        ahp_parent_dir = os.path.join(
+            copy_dir, f'AirportHeliport_related_features_{copy_num:02d}')
+        os.makedirs(ahp_parent_dir, exist_ok=True)
+        for ahp_uuid, ahp_features in airport_features.items():
+            ahp_name = airport_names.get(ahp_uuid, ahp_uuid)
+            folder_name = re.sub(r'[/\\. ]+', '_', ahp_name).strip('_')
+            ahp_dir = os.path.join(ahp_parent_dir, folder_name)
+            os.makedirs(ahp_dir, exist_ok=True)
+            ahp_by_type = {}
+            for feat_type, elem, new_uuid in ahp_features:
+                ahp_by_type.setdefault(feat_type, []).append((feat_type, elem, new_uuid))
+            for feat_type, feat_list in ahp_by_type.items():
+                fpath = os.path.join(ahp_dir, f'{feat_type}_{copy_num:02d}.xml')
+                doc = create_output_document(
+                    feat_list, gml_id=f'{feat_type}_Copy_{copy_num:02d}',
+                    comment=f'{feat_type} features - Copy {copy_num:02d}')
+                writes.append(pool.submit(_write_bytes, fpath, serialize_xml(doc)))
+
+        ordered_features = []
+        for ft in ALL_FEATURES_ORDER:
+            for feat_type, elem, new_uuid in copy_features:
+                if feat_type == ft:
+                    ordered_features.append((feat_type, elem, new_uuid))
+        all_feat_path = os.path.join(copy_dir, f'Donlon_ALL_Baseline_{copy_num:02d}.xml')
+        all_feat_doc = create_output_document(
+            ordered_features, gml_id=f'All_features_Copy_{copy_num:02d}',
+            comment=f'All features - Copy {copy_num:02d}')
+        writes.append(pool.submit(_write_bytes, all_feat_path, serialize_xml(all_feat_doc)))
+
+        for write in writes:
+            write.result()
+    return copy_dir, len(airport_features)
+
+
+def generate_copy(task):
+    """Clone the selected feature set onto one grid cell and write that copy's
+    folder, including its temporality use-cases.  task is
+    (index, target_lon, lat_offset, lon_scale); the shared inputs
+    come from _COPY_WORKER.
+
+    Returns (index, all_members, summary): all_members is this copy's clones
+    serialised in clone order (serialize_members), which the parent streams into
+    Donlon_Dataset_Copies_ALL.xml, and summary carries the counters
+    the parent reports (the excluded-reference log included, since it is
+    per-process).
+
+    Side effect: clears this process's EXCLUDED_REF_LOG, so that log holds
+    only this copy's excluded references when the summary is taken."""
+    i, target_lon, lat_offset, lon_scale = task
+    w = _COPY_WORKER
+    copy_num = i + 1
+    EXCLUDED_REF_LOG.clear()
+
+    cloned, new_membership, airport_names, uuid_map = clone_feature_set(
+        w['kept'], w['airport_membership'], i, w['anchor_lon'],
+        target_lon, lat_offset, lon_scale, begin_position=w['copy_begin'])
+
+    # old_uuid -> (type, clone_elem), for syncing the temporality cases.
+    new_to_old = {new: old for old, new in uuid_map.items()}
+    orig_to_clone = {new_to_old[nu]: (ft, el)
+                     for ft, el, nu in cloned if nu in new_to_old}
+
+    # Serialise the clones for the combined file before the per-copy documents
+    # below take the elements over.
+    all_members = serialize_members(cloned)
+
+    copy_dir, n_airports = write_copy_folder(
+        w['out_dir'], copy_num, cloned, new_membership, airport_names)
+
+    # Temporality use-cases for this copy: same scene transform as the clone.
+    tc_written, tc_warnings, tc_unmapped_dates = write_temporality_cases(
+        w['temporality_dir'], copy_dir, copy_num, uuid_map, orig_to_clone,
+        w['anchor_lon'], target_lon, lat_offset, lon_scale,
+        copy_begin=w['copy_begin'], apply_adm_fix=w['apply_adm_fix'],
+        oa_uuid_map=w['oa_uuid_map'],
+        remove_state_caa_refs=w['remove_state_caa_refs'])
+
+    summary = {
+        'features': len(cloned), 'airports': n_airports,
+        'tc_written': tc_written, 'tc_warnings': tc_warnings,
+        'tc_unmapped_dates': tc_unmapped_dates,
+        'excluded_refs': dict(EXCLUDED_REF_LOG),
+    }
+    return i, all_members, summary
 
 
 def _yesno(value):
@@ -2290,13 +2741,16 @@ def run_adm_fixes(root):
 def apply_adm_fixes(root):
     """Apply the ADM limit/timesheet corrections to the source tree before
     features are extracted and cloned, so every copy inherits them, and print a
-    summary."""
-    print("Applying ADM fixes (limits + timesheets) to the source ...")
+    summary.
+
+    The tree holds only the features parse_source retains, so the counts cover
+    those; RouteSegments are never retained, so their FLOOR/CEILING count is
+    not printed."""
+    print("Applying ADM fixes (limits + timesheets) to the retained source features ...")
     counts, warnings = run_adm_fixes(root)
     print(f"  UNL upperLimit -> FL 999 STD:        {counts['unl']}")
     print(f"  GND lowerLimit -> 0 + reference:     {counts['gnd']}")
     print(f"  Airspace FLOOR/CEILING replaced:     {counts['ase']}")
-    print(f"  RouteSegment FLOOR/CEILING replaced: {counts['rsg']}")
     print(f"  FL limits given reference STD:       {counts['fl']}")
     print(f"  Lower refs inherited from upper:     {counts['inh']}")
     print(f"  Timesheets startDate/endDate added:  {counts['ts']}")
@@ -2332,10 +2786,10 @@ def remove_state_caa_references(root):
 
     n_sup = 0
     for authority in list(root.iter(AIXM_AUTHORITY)):
-        afne = authority.find('aixm:AuthorityForNavaidEquipment', NSMAP)
+        afne = authority.find(AIXM_NS + 'AuthorityForNavaidEquipment')
         if afne is None:
             continue
-        type_elem = afne.find('aixm:type', NSMAP)
+        type_elem = afne.find(AIXM_TYPE)
         if type_elem is not None and (type_elem.text or '').strip() == 'SUPERVISE':
             parent = authority.getparent()
             if parent is not None:
@@ -2348,8 +2802,8 @@ def remove_state_caa_references(root):
 def apply_state_caa_removal(root):
     """Remove the State/CAA references from the source tree before features are
     extracted and cloned, so every copy inherits the removal, and print a
-    summary."""
-    print("Removing State/CAA references from the source ...")
+    summary (of the features parse_source retains)."""
+    print("Removing State/CAA references from the retained source features ...")
     n_sda, n_sup = remove_state_caa_references(root)
     print(f"  specialDateAuthority refs set to nil:  {n_sda}")
     print(f"  SUPERVISE authority elements removed:  {n_sup}")
@@ -2445,7 +2899,7 @@ def prompt_for_args():
         effectiveDateStart=effective_date,
         temporality_cases_dir=temporality, apply_adm_fix=apply_adm,
         remove_state_caa_refs=remove_state_caa,
-        state_uuid=state_uuid, caa_uuid=caa_uuid)
+        state_uuid=state_uuid, caa_uuid=caa_uuid, workers=None)
 
 
 # ---------------------------------------------------------------------------
@@ -2507,6 +2961,9 @@ def main():
                              f'OrganisationAuthority ({DONLON_CAA_OA_UUID}, '
                              '"DONLON CIVIL AVIATION ADMINISTRATION EA-CAA") with '
                              'this UUID in all copies and their temporality cases.')
+    parser.add_argument('--workers', type=int, default=None, metavar='N',
+                        help='Number of worker processes the copies are generated '
+                             'with (default: one per CPU; 1 runs in-process).')
     # Run interactively (prompt for each input on its own line) when started with
     # no command-line arguments; otherwise parse the CLI as usual.
     if len(sys.argv) == 1:
@@ -2554,6 +3011,8 @@ def main():
               f"(a {rows}x{cols} grid holds {rows * cols} cells and there is one "
               f"airport designator letter per copy, max {MAX_AIRPORT_COPIES}).")
         sys.exit(1)
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be >= 1')
 
     ase_types_exclude = AIRSPACE_TYPES_EXCLUDE_DEFAULT | set(args.exc_airspace_types)
 
@@ -2586,8 +3045,7 @@ def main():
     print()
 
     print(f"Parsing {args.input} ...")
-    tree = etree.parse(args.input)
-    root = tree.getroot()
+    root = parse_source(args.input, FEATURE_TYPES + SOURCE_EXTRA_TYPES)
 
     # Optionally apply the ADM limit/timesheet corrections to the whole source
     # tree first, so every cloned copy inherits them.  Done before extraction so
@@ -2607,7 +3065,7 @@ def main():
     if oa_uuid_map:
         n_oa = replace_uuid_everywhere(root, oa_uuid_map)
         print(f"Replacing OrganisationAuthority references ... "
-              f"{n_oa} occurrence(s) in the source.\n")
+              f"{n_oa} occurrence(s) in the retained source features.\n")
 
     # Re-time the aixm:plannedOperational dates on the in-memory source tree
     # before extraction/cloning, so every cloned copy inherits them (the input
@@ -2708,53 +3166,66 @@ def main():
 
     # Generate the copies: latitude offset + longitude scaled about the anchor
     # so each copy keeps the source's true ground shape at its new latitude.
-    print(f"\nGenerating {count} copies ({count * len(kept)} features total) ...")
-    all_cloned = []
-    per_copy_data = []
-    for cell in grid:
+    # Every copy is independent (own UUIDs, own clones, own folder), so the
+    # copies are cloned and written in parallel worker processes.
+    workers = min(args.workers or os.cpu_count() or 1, count)
+    print(f"\nGenerating {count} copies ({count * len(kept)} features total) "
+          f"with {workers} worker process(es) ...")
+    copy_begin = None
+    if effective_start is not None:
+        copy_begin = effective_start.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    tasks = []
+    lat_offsets, lon_scales = grid_transforms(grid, tma_lat)
+    for cell, lat_offset, lon_scale in zip(grid, lat_offsets, lon_scales):
         i = cell['index']
         copy_num = i + 1
-        lat_offset = cell['lat'] - tma_lat
-        cos_target = math.cos(math.radians(cell['lat']))
-        lon_scale = (math.cos(math.radians(tma_lat)) / cos_target
-                     if abs(cos_target) > 1e-6 else 1.0)
-
-        copy_begin = None
-        if effective_start is not None:
-            copy_begin = effective_start.strftime('%Y-%m-%dT%H:%M:%SZ')
 
         time_info = f"  validTime.beginPosition={copy_begin}" if copy_begin else ""
         print(f"  Copy {copy_num:02d}: grid (row {cell['row']}, col {cell['col']}) "
               f"-> lat {cell['lat']:.4f}, lon {cell['lon']:.4f}  "
               f"(lat offset {lat_offset:+.4f}, lon scale {lon_scale:.4f}){time_info}")
+        tasks.append((i, cell['lon'], lat_offset, lon_scale))
 
-        cloned, new_membership, airport_names, uuid_map = clone_feature_set(
-            kept, airport_membership, i, tma_lat, tma_lon, cell['lat'], cell['lon'],
-            begin_position=copy_begin)
-
-        # old_uuid -> (type, clone_elem), for syncing the temporality cases.
-        new_to_old = {new: old for old, new in uuid_map.items()}
-        orig_to_clone = {new_to_old[nu]: (ft, el)
-                         for ft, el, nu in cloned if nu in new_to_old}
-        transform_params = (tma_lon, cell['lon'], lat_offset, lon_scale)
-
-        per_copy_data.append((cloned, new_membership, airport_names, uuid_map,
-                              orig_to_clone, transform_params, copy_begin))
-        all_cloned.extend(cloned)
-
-    print_excluded_refs_summary()
-
-    # --- Write outputs ---
     out_dir = os.path.abspath(args.output)
     os.makedirs(out_dir, exist_ok=True)
 
+    settings = {
+        'airport_membership': airport_membership,
+        'anchor_lon': tma_lon, 'copy_begin': copy_begin,
+        'out_dir': out_dir, 'temporality_dir': temporality_dir,
+        'apply_adm_fix': args.apply_adm_fix, 'oa_uuid_map': oa_uuid_map,
+        'remove_state_caa_refs': args.remove_state_caa_refs,
+    }
+    serialized_kept = serialize_features(kept)
+    results = {}
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_copy_worker,
+                                  initargs=(serialized_kept, settings)) as pool:
+            for res in pool.imap_unordered(generate_copy, tasks, chunksize=1):
+                results[res[0]] = res
+    else:
+        _init_copy_worker(serialized_kept, settings)
+        for task in tasks:
+            res = generate_copy(task)
+            results[res[0]] = res
+    per_copy = [results[i] for i in sorted(results)]
+
+    EXCLUDED_REF_LOG.clear()
+    for _i, _all_members, summary in per_copy:
+        for key, n in summary['excluded_refs'].items():
+            EXCLUDED_REF_LOG[key] += n
+    print_excluded_refs_summary()
+
+    # --- Write the combined outputs ---
     all_file = os.path.join(out_dir, 'Donlon_Dataset_Copies_ALL.xml')
     print(f"\nBuilding {all_file} ...")
-    all_tree = create_output_document(
-        all_cloned, gml_id='Donlon_Dataset_Copies_ALL',
+    write_streamed_document(
+        all_file, (all_members for _i, all_members, _summary in per_copy),
+        gml_id='Donlon_Dataset_Copies_ALL',
         comment='Generated Donlon TMA-area dataset copies')
-    write_xml(all_tree, all_file)
-    print(f"  {len(all_cloned)} features written.")
+    n_all = sum(summary['features'] for _i, _m, summary in per_copy)
+    print(f"  {n_all} features written.")
 
     # Shared OrganisationAuthority features: the per-copy files reference these
     # (theOrganisationAuthority / specialDateAuthority) but don't contain them,
@@ -2770,96 +3241,26 @@ def main():
     print(f"  Donlon_OrganisationAuthority.xml: {n_org} OrganisationAuthority "
           f"feature(s) written{org_date_info}.")
 
-    COMMON_ONLY_TYPES = {
-        'VerticalStructure', 'Airspace', 'DesignatedPoint', 'AeronauticalGroundLight',
-        'Navaid', 'VOR', 'DME', 'NDB', 'TACAN', 'Localizer', 'Glidepath', 'MarkerBeacon',
-    }
-    AIRPORT_OR_COMMON_TYPES = {
-        'AirportHeliport', 'Runway', 'RunwayDirection', 'RunwayElement',
-        'RunwayCentrelinePoint', 'TouchDownLiftOff', 'Taxiway', 'TaxiwayElement',
-        'Apron', 'ApronElement', 'AircraftStand', 'WorkArea',
-    }
-
     temporality_total = 0
     temporality_warnings = []
 
-    print("\nWriting per-copy folders ...")
-    for i, (copy_features, new_membership, airport_names, uuid_map, orig_to_clone,
-            transform_params, copy_begin) in enumerate(per_copy_data):
+    print("\nPer-copy folders:")
+    for i, _all_members, summary in per_copy:
         copy_num = i + 1
-        copy_dir = os.path.join(out_dir, f'Donlon_Copy_{copy_num:02d}')
-        os.makedirs(copy_dir, exist_ok=True)
-
-        common_features = []
-        airport_features = {}
-        for feat_type, elem, new_uuid in copy_features:
-            if feat_type in COMMON_ONLY_TYPES:
-                common_features.append((feat_type, elem, new_uuid))
-            elif feat_type in AIRPORT_OR_COMMON_TYPES:
-                ahp_uuid = new_membership.get(new_uuid)
-                if ahp_uuid:
-                    airport_features.setdefault(ahp_uuid, []).append(
-                        (feat_type, elem, new_uuid))
-                else:
-                    common_features.append((feat_type, elem, new_uuid))
-
-        common_dir = os.path.join(copy_dir, f'Common_{copy_num:02d}')
-        os.makedirs(common_dir, exist_ok=True)
-        common_by_type = {}
-        for feat_type, elem, new_uuid in common_features:
-            common_by_type.setdefault(feat_type, []).append((feat_type, elem, new_uuid))
-        for feat_type, feat_list in common_by_type.items():
-            fpath = os.path.join(common_dir, f'{feat_type}_{copy_num:02d}.xml')
-            doc = create_output_document(
-                feat_list, gml_id=f'{feat_type}_Copy_{copy_num:02d}',
-                comment=f'{feat_type} features - Copy {copy_num:02d}')
-            write_xml(doc, fpath)
-
-        ahp_parent_dir = os.path.join(
-            copy_dir, f'AirportHeliport_related_features_{copy_num:02d}')
-        os.makedirs(ahp_parent_dir, exist_ok=True)
-        for ahp_uuid, ahp_features in airport_features.items():
-            ahp_name = airport_names.get(ahp_uuid, ahp_uuid)
-            folder_name = re.sub(r'[/\\. ]+', '_', ahp_name).strip('_')
-            ahp_dir = os.path.join(ahp_parent_dir, folder_name)
-            os.makedirs(ahp_dir, exist_ok=True)
-            ahp_by_type = {}
-            for feat_type, elem, new_uuid in ahp_features:
-                ahp_by_type.setdefault(feat_type, []).append((feat_type, elem, new_uuid))
-            for feat_type, feat_list in ahp_by_type.items():
-                fpath = os.path.join(ahp_dir, f'{feat_type}_{copy_num:02d}.xml')
-                doc = create_output_document(
-                    feat_list, gml_id=f'{feat_type}_Copy_{copy_num:02d}',
-                    comment=f'{feat_type} features - Copy {copy_num:02d}')
-                write_xml(doc, fpath)
-
-        ordered_features = []
-        for ft in ALL_FEATURES_ORDER:
-            for feat_type, elem, new_uuid in copy_features:
-                if feat_type == ft:
-                    ordered_features.append((feat_type, elem, new_uuid))
-        all_feat_path = os.path.join(copy_dir, f'Donlon_ALL_Baseline_{copy_num:02d}.xml')
-        all_feat_doc = create_output_document(
-            ordered_features, gml_id=f'All_features_Copy_{copy_num:02d}',
-            comment=f'All features - Copy {copy_num:02d}')
-        write_xml(all_feat_doc, all_feat_path)
-
-        # Temporality use-cases for this copy: same scene transform as the clone.
-        anchor_lon, target_lon, lat_offset, lon_scale = transform_params
-        tc_written, tc_warnings = write_temporality_cases(
-            temporality_dir, copy_dir, copy_num, uuid_map, orig_to_clone,
-            anchor_lon, target_lon, lat_offset, lon_scale, copy_begin=copy_begin,
-            apply_adm_fix=args.apply_adm_fix, oa_uuid_map=oa_uuid_map,
-            remove_state_caa_refs=args.remove_state_caa_refs)
+        tc_written = summary['tc_written']
         temporality_total += tc_written
-        temporality_warnings.extend(tc_warnings)
+        temporality_warnings.extend(summary['tc_warnings'])
         tc_info = (f" + {TEMPORALITY_OUTPUT_DIRNAME}_{copy_num:02d}/ ({tc_written} file(s))"
                    if tc_written else "")
 
         print(f"  Donlon_Copy_{copy_num:02d}/: Common/ + "
-              f"{len(airport_features)} airport folder(s) + "
+              f"{summary['airports']} airport folder(s) + "
               f"Donlon_ALL_Baseline_{copy_num:02d}.xml{tc_info}, "
-              f"{len(copy_features)} features")
+              f"{summary['features']} features")
+        if summary['tc_unmapped_dates']:
+            print(f"    NOTE: temporality date(s) not in TEMPORALITY_DATE_CONVERSIONS "
+                  f"(shifted +{TEMPORALITY_DATE_SHIFT_DAYS} days instead): "
+                  f"{', '.join(summary['tc_unmapped_dates'])}")
 
     if temporality_dir and os.path.isdir(temporality_dir):
         print(f"\nTemporality cases: {temporality_total} file(s) written across "
@@ -2874,7 +3275,7 @@ def main():
         print(f"\nTemporality cases: template folder not found at "
               f"{temporality_dir}; skipped.")
 
-    print(f"\nDone!  {len(all_cloned)} features total in {out_dir}")
+    print(f"\nDone!  {n_all} features total in {out_dir}")
     return 0
 
 